@@ -1,4 +1,7 @@
-from typing import List, Optional, Any
+import array
+from typing import List, Tuple
+
+import numpy as np
 
 
 class CircularBuffer:
@@ -15,7 +18,9 @@ class CircularBuffer:
             size: Maximum number of items to store (default: 50)
         """
         self.size = size
-        self.buffer: List[Optional[Any]] = [None] * size
+        # Prices are stored as packed C doubles rather than boxed floats;
+        # count (not a sentinel value) tracks which slots are in use
+        self.buffer = array.array('d', [0.0] * size)
         self.write_index = 0
         self.count = 0  # Track how many items have been added
     
@@ -28,11 +33,32 @@ class CircularBuffer:
             price: The price value to add
         """
         self.buffer[self.write_index] = price
-        self.write_index = (self.write_index + 1) % self.size
+        # Wrap with a compare-and-reset instead of a modulo on every add
+        self.write_index += 1
+        if self.write_index == self.size:
+            self.write_index = 0
         
         if self.count < self.size:
             self.count += 1
     
+    def get_all_view(self) -> Tuple[memoryview, memoryview]:
+        """
+        Get zero-copy views of the stored prices in chronological order.
+        The two segments concatenated give oldest to newest; while the buffer
+        is not full the second segment is empty. The views read the live
+        buffer, so consume them before the next add().
+        
+        Returns:
+            Tuple of (older segment, newer segment) memoryviews of doubles
+        """
+        view = memoryview(self.buffer)
+        if self.count < self.size:
+            # Buffer is not full yet, items run from index 0 to count
+            return view[:self.count], view[:0]
+        
+        # Buffer is full, the oldest item sits at write_index
+        return view[self.write_index:], view[:self.write_index]
+    
     def get_all(self) -> List[float]:
         """
         Get all stored prices in chronological order (oldest to newest).
@@ -40,24 +66,23 @@ class CircularBuffer:
         Returns:
             List of all prices stored in the buffer
         """
-        if self.count == 0:
-            return []
-        
-        result: List[float] = []
-        
-        if self.count < self.size:
-            # Buffer is not full yet, return items from index 0 to count
-            for i in range(self.count):
-                if self.buffer[i] is not None:
-                    result.append(self.buffer[i])
-        else:
-            # Buffer is full, start from write_index (oldest item)
-            for i in range(self.size):
-                idx = (self.write_index + i) % self.size
-                if self.buffer[idx] is not None:
-                    result.append(self.buffer[idx])
+        older, newer = self.get_all_view()
+        return older.tolist() + newer.tolist()
+    
+    def get_numpy_view(self) -> np.ndarray:
+        """
+        Get the stored prices as a float64 NumPy array (oldest to newest).
+        Zero-copy while the stored prices are contiguous; once the buffer
+        has wrapped, the two segments are joined into a new array.
         
-        return result
+        Returns:
+            1-D float64 array of all prices stored in the buffer
+        """
+        older, newer = self.get_all_view()
+        older_array = np.frombuffer(older, dtype=np.float64)
+        if len(newer) == 0:
+            return older_array
+        return np.concatenate((older_array, np.frombuffer(newer, dtype=np.float64)))
     
     def is_full(self) -> bool:
         """Check if the buffer is full."""
@@ -66,4 +91,3 @@ class CircularBuffer:
     def __len__(self) -> int:
         """Return the number of items currently in the buffer."""
         return self.count
-
@@ -1,11 +1,18 @@
-from typing import List, Optional, Dict, Any
-from enum import Enum
+import threading
+from typing import Final, List, Literal, Optional, Dict, Any
 
+import orjson
 
-class OrderType(Enum):
-    """Enumeration for order types."""
-    BUY = "BUY"
-    SELL = "SELL"
+
+# Order types are plain strings so hot-path comparisons are str compares
+OrderType = Literal["BUY", "SELL"]
+BUY: Final[OrderType] = "BUY"
+SELL: Final[OrderType] = "SELL"
+
+
+class QueueFullError(Exception):
+    """Raised when enqueuing onto an OrderQueue that has reached its max size."""
+    pass
 
 
 class Order:
@@ -33,29 +40,76 @@ class Order:
         self.price = price
         self.timestamp = timestamp
         self.leader_id = leader_id
+        self._json_bytes: Optional[bytes] = None  # Cached by to_json_bytes
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert order to dictionary."""
         return {
             'order_id': self.order_id,
-            'order_type': self.order_type.value,
+            'order_type': self.order_type,
             'symbol': self.symbol,
             'quantity': self.quantity,
             'price': self.price,
             'timestamp': self.timestamp,
             'leader_id': self.leader_id,
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the order to JSON bytes.
+        Orders are not modified after creation, so the bytes are cached.
+        """
+        if self._json_bytes is None:
+            self._json_bytes = orjson.dumps(self.to_dict())
+        return self._json_bytes
 
 
 class OrderQueue:
     """
     A FIFO (First-In-First-Out) queue implementation for handling trading orders.
     Orders are processed in the order they were added.
+    
+    Backed by a preallocated ring buffer indexed by head/tail, so enqueue and
+    dequeue do not allocate. A bounded queue allocates its full capacity up
+    front; an unbounded one doubles its capacity when it fills.
+    Operations are guarded by a lock so producers and the consumer may run
+    on different threads.
     """
     
-    def __init__(self):
-        """Initialize an empty order queue."""
-        self.queue: List[Order] = []
+    INITIAL_CAPACITY = 64  # Starting capacity of an unbounded queue
+    
+    def __init__(self, maxsize: int = 0):
+        """
+        Initialize an empty order queue.
+        
+        Args:
+            maxsize: Maximum number of pending orders; 0 means unbounded
+        """
+        self.maxsize = maxsize
+        self._capacity = maxsize if maxsize > 0 else self.INITIAL_CAPACITY
+        self._buffer: List[Optional[Order]] = [None] * self._capacity
+        self._head = 0  # Index of the oldest order
+        self._tail = 0  # Index the next order is written to
+        self._count = 0
+        self._lock = threading.Lock()
+        # Set while the queue holds orders, so is_empty() is a single
+        # lock-free flag read from any thread
+        self._nonempty = threading.Event()
+    
+    def _ordered(self, count: int) -> List[Order]:
+        """Return the oldest `count` orders as at most two slices (lock held)."""
+        end = self._head + count
+        if end <= self._capacity:
+            return self._buffer[self._head:end]
+        return self._buffer[self._head:] + self._buffer[:end - self._capacity]
+    
+    def _grow(self) -> None:
+        """Double the ring buffer's capacity, unwrapping it to start at 0 (lock held)."""
+        orders = self._ordered(self._count)
+        self._capacity *= 2
+        self._buffer = orders + [None] * (self._capacity - self._count)
+        self._head = 0
+        self._tail = self._count
     
     def enqueue(self, order: Order) -> None:
         """
@@ -63,8 +117,23 @@ class OrderQueue:
         
         Args:
             order: The order to add to the queue
+        
+        Raises:
+            QueueFullError: If the queue already holds maxsize orders
         """
-        self.queue.append(order)
+        with self._lock:
+            if self._count == self._capacity:
+                if self.maxsize:
+                    raise QueueFullError(f"Order queue is full ({self.maxsize} pending orders)")
+                self._grow()
+            
+            self._buffer[self._tail] = order
+            # Wrap with a compare-and-reset instead of a modulo
+            self._tail += 1
+            if self._tail == self._capacity:
+                self._tail = 0
+            self._count += 1
+            self._nonempty.set()
     
     def dequeue(self) -> Optional[Order]:
         """
@@ -73,11 +142,20 @@ class OrderQueue:
         Returns:
             The oldest order in the queue, or None if queue is empty
         """
-        if self.is_empty():
-            return None
-        
-        # Remove and return the first element (oldest order)
-        return self.queue.pop(0)
+        with self._lock:
+            if self._count == 0:
+                return None
+            
+            # Remove and return the first element (oldest order)
+            order = self._buffer[self._head]
+            self._buffer[self._head] = None
+            self._head += 1
+            if self._head == self._capacity:
+                self._head = 0
+            self._count -= 1
+            if self._count == 0:
+                self._nonempty.clear()
+            return order
     
     def peek(self) -> Optional[Order]:
         """
@@ -86,17 +164,18 @@ class OrderQueue:
         Returns:
             The oldest order in the queue, or None if queue is empty
         """
-        if self.is_empty():
-            return None
-        return self.queue[0]
+        with self._lock:
+            if self._count == 0:
+                return None
+            return self._buffer[self._head]
     
     def is_empty(self) -> bool:
         """Check if the queue is empty."""
-        return len(self.queue) == 0
+        return not self._nonempty.is_set()
     
     def size(self) -> int:
         """Return the number of orders in the queue."""
-        return len(self.queue)
+        return self._count
     
     def get_all(self) -> List[Order]:
         """
@@ -105,9 +184,56 @@ class OrderQueue:
         Returns:
             List of all orders in the queue
         """
-        return self.queue.copy()
+        with self._lock:
+            return self._ordered(self._count)
+    
+    def drain(self, max_orders: Optional[int] = None) -> List[Order]:
+        """
+        Remove and return orders from the front of the queue (oldest to newest).
+        The orders are copied out as at most two slices of the ring buffer
+        instead of being dequeued one by one.
+        
+        Args:
+            max_orders: Optional maximum number of orders to remove
+        
+        Returns:
+            List of the removed orders
+        
+        Raises:
+            ValueError: If max_orders is negative
+        """
+        if max_orders is not None and max_orders < 0:
+            raise ValueError(f"max_orders must be non-negative, got {max_orders}")
+        
+        with self._lock:
+            count = self._count
+            if max_orders is not None and max_orders < count:
+                count = max_orders
+            if count == 0:
+                return []
+            
+            orders = self._ordered(count)
+            
+            # Release the drained slots so the orders can be garbage collected
+            end = self._head + count
+            if end <= self._capacity:
+                self._buffer[self._head:end] = [None] * count
+            else:
+                end -= self._capacity
+                self._buffer[self._head:] = [None] * (self._capacity - self._head)
+                self._buffer[:end] = [None] * end
+            
+            self._head = end if end < self._capacity else 0
+            self._count -= count
+            if self._count == 0:
+                self._nonempty.clear()
+            return orders
     
     def clear(self) -> None:
         """Remove all orders from the queue."""
-        self.queue.clear()
-
+        with self._lock:
+            self._buffer = [None] * self._capacity
+            self._head = 0
+            self._tail = 0
+            self._count = 0
+            self._nonempty.clear()
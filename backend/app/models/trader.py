@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
@@ -11,15 +11,14 @@ class TraderBase(BaseModel):
 
 class TraderCreate(TraderBase):
     """Model for creating a new trader."""
-    pass
+    model_config = ConfigDict(frozen=True)
 
 
 class TraderResponse(TraderBase):
     """Model for trader response with ID."""
-    trader_id: str = Field(..., description="Unique identifier for the trader")
+    model_config = ConfigDict(from_attributes=True)
     
-    class Config:
-        from_attributes = True
+    trader_id: str = Field(..., description="Unique identifier for the trader")
 
 
 class Trader(TraderBase):
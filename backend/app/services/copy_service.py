@@ -1,8 +1,13 @@
+import asyncio
+import heapq
+import threading
 import uuid
 import time
-from typing import Dict, List, Optional, Any
-from app.dsa.order_queue import OrderQueue, Order, OrderType
-from app.dsa.max_heap import LeaderboardHeap, Trader
+from operator import attrgetter
+import orjson
+from typing import Dict, List, Optional, Any, Set, Tuple
+from app.dsa.order_queue import OrderQueue, Order, OrderType, BUY
+from app.dsa.max_heap import Trader
 from app.models.trader import TraderCreate, TraderResponse
 
 
@@ -12,13 +17,26 @@ class CopyService:
     Handles leader trades, follower execution, and trader management.
     """
     
+    # Pending leader orders beyond this are rejected until the worker catches up
+    MAX_PENDING_ORDERS = 10_000
+    
     def __init__(self):
         """Initialize the copy trading service."""
-        self.order_queue = OrderQueue()
-        self.leaderboard_heap = LeaderboardHeap()
+        self.order_queue = OrderQueue(maxsize=self.MAX_PENDING_ORDERS)
         self.traders: Dict[str, Trader] = {}  # Store traders by trader_id
-        self.followers: Dict[str, List[str]] = {}  # Map leader_id -> [follower_ids]
+        self.followers: Dict[str, Set[str]] = {}  # Map leader_id -> {follower_ids}
         self.is_processing = False
+        # Guards traders, followers and leaderboard state, which HTTP handlers
+        # and the order worker thread access concurrently
+        self._lock = threading.RLock()
+        # Set whenever an order is enqueued so the consumer can sleep until then;
+        # recreated by wait_for_orders for each consumer loop it runs on
+        self._wakeup = asyncio.Event()
+        self._wakeup_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Bumped on every change to a trader's ROI or portfolio value
+        self._leaderboard_version = 0
+        # Serialized leaderboard as (version, limit, JSON bytes)
+        self._lb_cache: Optional[Tuple[int, int, bytes]] = None
     
     def register_trader(self, trader_data: TraderCreate, trader_id: Optional[str] = None) -> Trader:
         """
@@ -42,23 +60,16 @@ class CopyService:
             portfolio_value=trader_data.portfolio_value
         )
         
-        # If trader exists, remove from heap first before updating
-        if trader_id in self.traders:
-            # Rebuild heap (simple approach - in production, use update operation)
-            self._rebuild_heap()
-        
-        self.traders[trader_id] = trader
-        
-        # Add/update in leaderboard heap
-        self.leaderboard_heap.insert(trader)
+        with self._lock:
+            self.traders[trader_id] = trader
+            self._leaderboard_version += 1
         
         return trader
     
-    def _rebuild_heap(self) -> None:
-        """Rebuild the heap with current traders."""
-        self.leaderboard_heap = LeaderboardHeap()
-        for trader in self.traders.values():
-            self.leaderboard_heap.insert(trader)
+    @property
+    def leaderboard_version(self) -> int:
+        """Version counter that changes whenever leaderboard data changes."""
+        return self._leaderboard_version
     
     def execute_leader_trade(self, leader_id: str, order_type: OrderType, 
                             symbol: str, quantity: float, price: float) -> Order:
@@ -77,6 +88,7 @@ class CopyService:
         
         Raises:
             ValueError: If leader_id is not found
+            QueueFullError: If too many orders are already pending
         """
         if leader_id not in self.traders:
             raise ValueError(f"Leader with ID {leader_id} not found")
@@ -88,94 +100,131 @@ class CopyService:
             symbol=symbol,
             quantity=quantity,
             price=price,
-            timestamp=int(time.time() * 1000),  # Milliseconds
+            timestamp=time.time_ns() // 1_000_000,  # Milliseconds
             leader_id=leader_id
         )
         
         # Push to order queue for followers to copy
         self.order_queue.enqueue(order)
+        self._notify_orders()
         
         return order
     
-    def process_orders_for_followers(self) -> List[Dict[str, Any]]:
+    def _notify_orders(self) -> None:
+        """Wake the order consumer, scheduling on its loop if it is waiting."""
+        loop = self._wakeup_loop
+        if loop is None or loop.is_closed():
+            self._wakeup.set()
+        else:
+            # Safe to call from any thread, including the consumer's own
+            loop.call_soon_threadsafe(self._wakeup.set)
+    
+    async def wait_for_orders(self) -> None:
+        """
+        Wait until at least one order has been enqueued since the last wakeup.
+        Intended for a single consumer task, which should drain the queue
+        after each wakeup.
+        """
+        loop = asyncio.get_running_loop()
+        if self._wakeup_loop is not loop:
+            # An asyncio.Event binds to the first loop that waits on it, so a
+            # consumer started on a new loop (e.g. after an app restart) needs
+            # its own. Orders queued before the switch must still wake it.
+            self._wakeup = asyncio.Event()
+            self._wakeup_loop = loop
+            if not self.order_queue.is_empty():
+                self._wakeup.set()
+        await self._wakeup.wait()
+        self._wakeup.clear()
+    
+    def process_orders_for_followers(self, max_orders: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Process orders from the queue and execute for followers.
         This is called by the background task.
         
+        Args:
+            max_orders: Optional maximum number of orders to process in this call
+        
         Returns:
             List of execution results
         """
         executed_orders = []
+        append_result = executed_orders.append
+        extend_results = executed_orders.extend
         
-        while not self.order_queue.is_empty():
-            order = self.order_queue.dequeue()
-            
-            if order is None:
-                break
-            
+        # Bind hot attributes to locals once for the whole drain
+        lock = self._lock
+        traders = self.traders
+        followers = self.followers
+        execute_follower_trades = self._execute_follower_trades
+        
+        for order in self.order_queue.drain(max_orders):
             # Execute trade for followers of the specific leader who created this order
             follower_count = 0
-            if order.leader_id and order.leader_id in self.followers:
-                follower_ids = self.followers[order.leader_id]
-                for follower_id in follower_ids:
-                    if follower_id in self.traders:
-                        # Execute trade for follower
-                        result = self._execute_follower_trade(follower_id, order)
-                        executed_orders.append(result)
-                        follower_count += 1
+            if order.leader_id:
+                # Hold the lock per order, not per batch, so HTTP handlers
+                # waiting on it are delayed by at most one fan-out. Followers
+                # are read live, so a follow made before the order was queued
+                # is always included.
+                with lock:
+                    follower_ids = followers.get(order.leader_id, ())
+                    order_followers = [traders[fid] for fid in follower_ids if fid in traders]
+                    if order_followers:
+                        extend_results(execute_follower_trades(order_followers, order))
+                        follower_count = len(order_followers)
             
-            executed_orders.append({
+            append_result({
                 'order_id': order.order_id,
                 'status': 'processed',
                 'symbol': order.symbol,
-                'type': order.order_type.value,
+                'type': order.order_type,
                 'leader_id': order.leader_id,
                 'followers_count': follower_count
             })
         
         return executed_orders
     
-    def _execute_follower_trade(self, follower_id: str, order: Order) -> Dict[str, Any]:
+    def _execute_follower_trades(self, followers: List[Trader], order: Order) -> List[Dict[str, Any]]:
         """
-        Execute a trade for a follower (simulated).
+        Execute a trade for a batch of followers (simulated).
+        The fee-adjusted portfolio change is computed once per order.
         
         Args:
-            follower_id: ID of the follower
+            followers: Followers to execute the trade for
             order: Order to execute
         
         Returns:
-            Execution result dictionary
+            List of execution result dictionaries
         """
-        follower = self.traders.get(follower_id)
-        if follower is None:
-            return {
-                'follower_id': follower_id,
-                'status': 'failed',
-                'reason': 'Follower not found'
-            }
-        
         # Simulate trade execution
         # In a real system, this would interact with an exchange API
         trade_value = order.quantity * order.price
         
-        # Update follower's portfolio (simplified)
-        if order.order_type == OrderType.BUY:
+        # Update followers' portfolios (simplified)
+        if order.order_type == BUY:
             # Buying: reduce cash, increase holdings
-            follower.portfolio_value -= trade_value * 0.001  # Small fee
+            delta = -(trade_value * 0.001)  # Small fee
         else:  # SELL
             # Selling: increase cash, reduce holdings
-            follower.portfolio_value += trade_value * 0.999  # Small fee
-        
-        return {
-            'follower_id': follower_id,
-            'follower_name': follower.name,
-            'order_id': order.order_id,
-            'status': 'executed',
-            'symbol': order.symbol,
-            'type': order.order_type.value,
-            'quantity': order.quantity,
-            'price': order.price
-        }
+            delta = trade_value * 0.999  # Small fee
+        
+        self._leaderboard_version += 1
+        
+        results = []
+        for follower in followers:
+            follower.update_portfolio(follower.portfolio_value + delta)
+            results.append({
+                'follower_id': follower.trader_id,
+                'follower_name': follower.name,
+                'order_id': order.order_id,
+                'status': 'executed',
+                'symbol': order.symbol,
+                'type': order.order_type,
+                'quantity': order.quantity,
+                'price': order.price
+            })
+        
+        return results
     
     def add_follower(self, leader_id: str, follower_id: str) -> bool:
         """
@@ -191,17 +240,15 @@ class CopyService:
         if leader_id not in self.traders or follower_id not in self.traders:
             return False
         
-        if leader_id not in self.followers:
-            self.followers[leader_id] = []
-        
-        if follower_id not in self.followers[leader_id]:
-            self.followers[leader_id].append(follower_id)
+        with self._lock:
+            # Sets give O(1) insertion with de-duplication built in
+            self.followers.setdefault(leader_id, set()).add(follower_id)
         
         return True
     
     def get_top_traders(self, limit: int = 5) -> List[Trader]:
         """
-        Get top N traders from the leaderboard heap.
+        Get the top N traders by ROI.
         
         Args:
             limit: Number of top traders to return
@@ -209,11 +256,34 @@ class CopyService:
         Returns:
             List of top traders sorted by ROI (descending)
         """
-        # Get all traders sorted by ROI
-        sorted_traders = self.leaderboard_heap.get_all_sorted()
+        # nlargest keeps a size-`limit` heap while scanning: O(n log k)
+        # instead of sorting every trader on each call
+        with self._lock:
+            return heapq.nlargest(limit, self.traders.values(), key=attrgetter('roi'))
+    
+    def get_leaderboard_json(self, limit: int = 5) -> bytes:
+        """
+        Get the top N traders as a serialized JSON leaderboard payload.
+        The bytes are cached until the leaderboard version changes.
+        
+        Args:
+            limit: Number of top traders to include
         
-        # Return top N
-        return sorted_traders[:limit]
+        Returns:
+            JSON bytes of {"top_traders": [...], "count": n}
+        """
+        with self._lock:
+            cache = self._lb_cache
+            if cache is not None and cache[0] == self._leaderboard_version and cache[1] == limit:
+                return cache[2]
+            
+            top_traders = self.get_top_traders(limit=limit)
+            payload = orjson.dumps({
+                'top_traders': [trader.to_dict() for trader in top_traders],
+                'count': len(top_traders),
+            })
+            self._lb_cache = (self._leaderboard_version, limit, payload)
+            return payload
     
     def get_trader(self, trader_id: str) -> Optional[Trader]:
         """Get a trader by ID."""
@@ -1,21 +1,71 @@
-import ccxt
-from typing import Dict, Any
+import asyncio
+import ssl
+import sys
+import time
+import aiohttp
+import certifi
+import ccxt.async_support as ccxt_async
+from typing import Dict, Any, Optional, Tuple
 from app.dsa.circular_buffer import CircularBuffer
 
 
 class MarketDataService:
     """Service for fetching market data from cryptocurrency exchanges."""
     
+    # Connection pool settings for the shared HTTP session
+    MAX_CONNECTIONS = 100
+    KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection is kept open
+    # Symbols not requested for this many seconds drop out of batched refreshes
+    SUBSCRIPTION_TTL = 60.0
+    
     def __init__(self):
-        """Initialize the Binance exchange instance."""
-        self.exchange = ccxt.binance({
-            'apiKey': None,  # Not needed for public data
-            'secret': None,  # Not needed for public data
-            'enableRateLimit': True,  # Respect rate limits
-        })
+        """Initialize the Binance exchange instance (async client)."""
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.exchange = self._create_exchange()
         # Dictionary to store CircularBuffer for each symbol
         # Each buffer stores the last 50 historical prices
         self.price_buffers: Dict[str, CircularBuffer] = {}
+        # Latest price data per symbol as (monotonic fetch time, price data)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.cache_ttl = 1.0  # Seconds a cached price is served before refetching
+        self._inflight: Dict[str, asyncio.Future] = {}  # Per-symbol in-flight fetches
+        # Exchange timestamp of the last sample stored in each symbol's buffer
+        self._last_sample_ts: Dict[str, Optional[int]] = {}
+        # Monotonic time each symbol was last served to a client
+        self._last_requested: Dict[str, float] = {}
+    
+    def _create_exchange(self, session: Optional[aiohttp.ClientSession] = None) -> ccxt_async.binance:
+        """
+        Create the Binance exchange client.
+        
+        Args:
+            session: Optional shared HTTP session; ccxt opens its own if omitted
+        
+        Returns:
+            Async Binance exchange instance
+        """
+        config: Dict[str, Any] = {
+            'apiKey': None,  # Not needed for public data
+            'secret': None,  # Not needed for public data
+            'enableRateLimit': True,  # Respect rate limits
+            'aiohttp_trust_env': True,  # Honour proxy settings from the environment
+        }
+        if session is not None:
+            config['session'] = session
+        return ccxt_async.binance(config)
+    
+    async def start(self) -> None:
+        """
+        Open a pooled keep-alive HTTP session and route all exchange requests
+        through it. Must be called from within the running event loop.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.MAX_CONNECTIONS,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+        )
+        self.session = aiohttp.ClientSession(connector=connector, trust_env=True)
+        self.exchange = self._create_exchange(self.session)
     
     def _get_or_create_buffer(self, symbol: str) -> CircularBuffer:
         """
@@ -31,10 +81,61 @@ class MarketDataService:
             self.price_buffers[symbol] = CircularBuffer(size=50)
         return self.price_buffers[symbol]
     
-    def get_live_price(self, symbol: str) -> Dict[str, Any]:
+    def _store_ticker(self, symbol: str, ticker: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Fetch the live ticker price for a given symbol from Binance.
-        Automatically stores the price in the CircularBuffer for historical tracking.
+        Record a fetched ticker in the price cache and the symbol's CircularBuffer.
+        
+        Args:
+            symbol: Trading pair symbol
+            ticker: Raw ticker returned by ccxt
+        
+        Returns:
+            Dictionary containing price information
+        """
+        # The exchange has accepted the symbol, so it belongs to the small set
+        # of real markets: intern it so every map keyed by it shares one
+        # object with a cached hash. Unvalidated input is never interned.
+        symbol = sys.intern(symbol)
+        current_price = ticker['last']
+        timestamp = ticker['timestamp']
+        
+        # Store price in CircularBuffer for historical tracking. The buffer
+        # holds packed doubles, so skip missing prices, and skip tickers the
+        # exchange has not updated since the last sample.
+        buffer = self._get_or_create_buffer(symbol)
+        if current_price is not None and (
+            timestamp is None or timestamp != self._last_sample_ts.get(symbol)
+        ):
+            buffer.add(current_price)
+            self._last_sample_ts[symbol] = timestamp
+        
+        # Return relevant price information
+        price_data = {
+            'symbol': symbol,
+            'price': current_price,
+            'bid': ticker['bid'],
+            'ask': ticker['ask'],
+            'high': ticker['high'],
+            'low': ticker['low'],
+            'volume': ticker['baseVolume'],
+            'timestamp': timestamp,
+        }
+        self._cache[symbol] = (time.monotonic(), price_data)
+        return price_data
+    
+    def _get_cached(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return the cached price data for a symbol if it is still fresh."""
+        cached = self._cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+    
+    async def get_live_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get the live ticker price for a given symbol.
+        Served from the price cache, which refresh_tickers keeps current; on a
+        cache miss the ticker is fetched from Binance directly, which also
+        subscribes the symbol to subsequent batched refreshes.
         
         Args:
             symbol: Trading pair symbol (e.g., 'BTC/USDT', 'ETH/USDT')
@@ -43,31 +144,72 @@ class MarketDataService:
             Dictionary containing price information
         
         Raises:
-            Exception: If the symbol is invalid or the API call fails
+            ValueError: If the symbol is invalid or the API call fails
+        """
+        price_data = self._get_cached(symbol)
+        if price_data is None:
+            # Single-flight: concurrent misses for the same symbol share one
+            # in-flight fetch. shield() keeps a cancelled caller from cancelling
+            # the fetch the other callers are waiting on.
+            fetch = self._inflight.get(symbol)
+            if fetch is None:
+                fetch = asyncio.ensure_future(self._fetch_price(symbol))
+                self._inflight[symbol] = fetch
+                fetch.add_done_callback(lambda _: self._inflight.pop(symbol, None))
+            price_data = await asyncio.shield(fetch)
+        
+        # Keeps the symbol in batched refreshes; only recorded for valid
+        # symbols, keyed by the interned copy _store_ticker created
+        self._last_requested[price_data['symbol']] = time.monotonic()
+        return price_data
+    
+    async def _fetch_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch a symbol's ticker from Binance and record it.
+        
+        Args:
+            symbol: Trading pair symbol
+        
+        Returns:
+            Dictionary containing price information
+        
+        Raises:
+            ValueError: If the symbol is invalid or the API call fails
         """
         try:
             # Fetch ticker data
-            ticker = self.exchange.fetch_ticker(symbol)
-            
-            current_price = ticker['last']
-            
-            # Store price in CircularBuffer for historical tracking
-            buffer = self._get_or_create_buffer(symbol)
-            buffer.add(current_price)
-            
-            # Return relevant price information
-            return {
-                'symbol': symbol,
-                'price': current_price,
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'high': ticker['high'],
-                'low': ticker['low'],
-                'volume': ticker['baseVolume'],
-                'timestamp': ticker['timestamp'],
-            }
-        except Exception as e:
-            raise Exception(f"Failed to fetch price for {symbol}: {str(e)}")
+            ticker = await self.exchange.fetch_ticker(symbol)
+        except ccxt_async.BaseError as e:
+            raise ValueError(f"Failed to fetch price for {symbol}: {str(e)}") from e
+        return self._store_ticker(symbol, ticker)
+    
+    async def refresh_tickers(self) -> None:
+        """
+        Refresh every subscribed symbol with a single batched exchange call.
+        A symbol stays subscribed while clients have requested it within the
+        last SUBSCRIPTION_TTL seconds. Fills the price cache and appends new
+        samples to each symbol's CircularBuffer.
+        
+        Raises:
+            ValueError: If the API call fails
+        """
+        cutoff = time.monotonic() - self.SUBSCRIPTION_TTL
+        symbols = [
+            symbol for symbol, requested_at in self._last_requested.items()
+            if requested_at >= cutoff
+        ]
+        if not symbols:
+            return
+        
+        try:
+            tickers = await self.exchange.fetch_tickers(symbols)
+        except ccxt_async.BaseError as e:
+            raise ValueError(f"Failed to refresh tickers: {str(e)}") from e
+        
+        for symbol in symbols:
+            ticker = tickers.get(symbol)
+            if ticker is not None:
+                self._store_ticker(symbol, ticker)
     
     def get_historical_prices(self, symbol: str) -> list:
         """
@@ -82,4 +224,35 @@ class MarketDataService:
         if symbol not in self.price_buffers:
             return []
         return self.price_buffers[symbol].get_all()
-
+    
+    def get_moving_average(self, symbol: str, window: int) -> Optional[float]:
+        """
+        Compute the simple moving average of the most recent prices for a symbol.
+        
+        Args:
+            symbol: Trading pair symbol
+            window: Number of most recent prices to average
+        
+        Returns:
+            The average of the last `window` prices, or None if fewer are stored
+        
+        Raises:
+            ValueError: If window is not positive
+        """
+        if window <= 0:
+            raise ValueError("window must be a positive integer")
+        
+        if symbol not in self.price_buffers:
+            return None
+        
+        prices = self.price_buffers[symbol].get_numpy_view()
+        if len(prices) < window:
+            return None
+        return float(prices[-window:].mean())
+    
+    async def close(self) -> None:
+        """Close the exchange client and the shared HTTP session."""
+        await self.exchange.close()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -1,61 +1,206 @@
 import asyncio
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 from app.services.market_data import MarketDataService
 from app.services.copy_service import CopyService
 from app.models.trader import TraderCreate, TraderResponse
-from app.dsa.order_queue import OrderType
+from app.dsa.order_queue import BUY, SELL, QueueFullError
 
-app = FastAPI(title="AlgoTrading API", version="1.0.0")
+# Log records are formatted and enqueued on the calling thread (QueueHandler
+# runs the formatter in prepare()); a QueueListener thread does the blocking
+# write to stderr
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+# Attached to the root logger only while the listener runs (see lifespan),
+# so importing this module leaves global logging untouched
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
 
-# Enable CORS for React frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Maximum number of orders drained from the queue per processing pass
+MAX_BATCH = int(os.getenv("ORDER_MAX_BATCH", "256"))
+if MAX_BATCH < 1:
+    raise ValueError(f"ORDER_MAX_BATCH must be at least 1, got {MAX_BATCH}")
 
 # Initialize services
 market_data_service = MarketDataService()
 copy_service = CopyService()
 
+# Prices are cached upstream for cache_ttl seconds, so clients may reuse them as long
+PRICE_CACHE_CONTROL = f"public, max-age={max(1, int(market_data_service.cache_ttl))}"
+# Leaderboard versions restart at 0 with the process; the boot id keeps
+# ETags issued by a previous process from matching
+_ETAG_BOOT_ID = uuid.uuid4().hex[:8]
 
-# Background task to continuously process orders
+
+# Background task to process orders as soon as they are queued
 async def process_orders_continuously():
-    """Background task that continuously processes orders from the queue."""
+    """Background task that processes orders from the queue whenever new ones arrive."""
     while True:
         try:
-            if not copy_service.order_queue.is_empty():
-                results = copy_service.process_orders_for_followers()
+            # Sleep until a leader trade is queued instead of polling
+            await copy_service.wait_for_orders()
+            while not copy_service.order_queue.is_empty():
+                results = copy_service.process_orders_for_followers(max_orders=MAX_BATCH)
                 if results:
-                    print(f"Processed {len(results)} orders for followers")
-            # Sleep for 1 second before checking again
-            await asyncio.sleep(1)
+                    logger.info("Processed %d orders for followers", len(results))
+                # Yield between batches so shutdown can cancel a long backlog
+                await asyncio.sleep(0)
+        except Exception:
+            logger.exception("Error processing orders")
+
+
+# Upper bound on the refresh interval while the exchange keeps failing
+REFRESH_MAX_BACKOFF = 30.0
+
+
+# Background task to keep cached market data fresh
+async def refresh_market_data_continuously():
+    """Background task that refreshes all subscribed tickers in one batched call."""
+    # Refresh at twice the cache TTL rate so cached prices stay fresh
+    interval = market_data_service.cache_ttl / 2
+    delay = interval
+    while True:
+        try:
+            await market_data_service.refresh_tickers()
+            delay = interval
         except Exception as e:
-            print(f"Error processing orders: {e}")
-            await asyncio.sleep(1)
+            # Back off exponentially while the exchange is unreachable
+            delay = min(delay * 2, REFRESH_MAX_BACKOFF)
+            logger.warning("Error refreshing market data (retrying in %.1fs): %s", delay, e)
+        await asyncio.sleep(delay)
+
+
+def _run_worker_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Thread target that runs the order worker's event loop.
+    Once the loop is stopped, tasks still pending on it are cancelled and
+    run to completion before the loop is closed.
+    """
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _log_worker_exit(future) -> None:
+    """Log the order worker's exception if it stops for any reason but cancellation."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Order worker stopped", exc_info=future.exception())
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Start background task when application starts."""
-    asyncio.create_task(process_orders_continuously())
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start logging, open the market data session and start background tasks
+    on startup; cancel the tasks and release resources on shutdown.
+    
+    Order processing runs on its own thread and event loop, so CPU spent
+    fanning out orders cannot stall HTTP handlers on the server loop.
+    """
+    _log_listener.start()
+    logging.getLogger().addHandler(_log_queue_handler)
+    await market_data_service.start()
+    
+    worker_loop = asyncio.new_event_loop()
+    worker_thread = threading.Thread(
+        target=_run_worker_loop, args=(worker_loop,), name="order-worker", daemon=True
+    )
+    worker_thread.start()
+    app.state.worker_loop = worker_loop
+    app.state.order_worker = asyncio.run_coroutine_threadsafe(
+        process_orders_continuously(), worker_loop
+    )
+    app.state.order_worker.add_done_callback(_log_worker_exit)
+    app.state.background_tasks = [
+        asyncio.create_task(refresh_market_data_continuously()),
+    ]
+    
+    yield
+    
+    # Thread-safe cancel: the task is cancelled on the worker loop
+    app.state.order_worker.cancel()
+    for task in app.state.background_tasks:
+        task.cancel()
+    await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+    
+    # The worker thread finishes pending tasks and closes its loop on exit
+    worker_loop.call_soon_threadsafe(worker_loop.stop)
+    await asyncio.to_thread(worker_thread.join, 5)
+    
+    await market_data_service.close()
+    logging.getLogger().removeHandler(_log_queue_handler)
+    _log_listener.stop()
+
+
+# ORJSONResponse encodes response dicts straight to bytes in C (via orjson)
+app = FastAPI(
+    title="AlgoTrading API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Enable CORS for React frontend. Methods and headers are listed explicitly
+# so preflight responses are static, and max_age lets browsers cache them
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:5173"],  
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+    expose_headers=["ETag"],
+    max_age=86400,
+)
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Turn unexpected errors into a 500 response; the server still logs the traceback."""
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+
+# Accepted order_type spellings, resolved with a single dict lookup
+_ORDER_MAP = {"BUY": BUY, "SELL": SELL, "buy": BUY, "sell": SELL}
+
+
+# Response envelope for queued trades, completed with the order's JSON and "}"
+_TRADE_QUEUED_PREFIX = b'{"message":"Trade order queued successfully","order":'
 
 
 # Request models
 class TradeExecuteRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     leader_id: str
-    order_type: str  # "BUY" or "SELL"
+    order_type: Literal["BUY", "SELL", "buy", "sell"]  # Validated by Pydantic
     symbol: str
     quantity: float
     price: float
 
 
 class FollowRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     leader_id: str
     follower_id: str
 
@@ -67,7 +212,7 @@ async def hello_world():
 
 
 @app.get("/api/price/{symbol}")
-async def get_price(symbol: str):
+async def get_price(symbol: str, response: Response):
     """
     Get live price for a cryptocurrency symbol.
     
@@ -78,9 +223,10 @@ async def get_price(symbol: str):
         Price data for the specified symbol
     """
     try:
-        price_data = market_data_service.get_live_price(symbol)
+        price_data = await market_data_service.get_live_price(symbol)
+        response.headers["Cache-Control"] = PRICE_CACHE_CONTROL
         return price_data
-    except Exception as e:
+    except (ValueError, KeyError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -95,22 +241,16 @@ async def register_trader(trader_data: TraderCreate):
     Returns:
         Created trader with ID
     """
-    try:
-        trader = copy_service.register_trader(trader_data)
-        return TraderResponse(
-            trader_id=trader.trader_id,
-            name=trader.name,
-            roi=trader.roi,
-            portfolio_value=trader.portfolio_value
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    trader = copy_service.register_trader(trader_data)
+    # Reuse the trader's cached dict; response_model validates it once
+    return trader.to_dict()
 
 
-@app.post("/api/leaders/{leader_id}/trade")
+@app.post("/api/leaders/{leader_id}/trade", status_code=202)
 async def execute_leader_trade(leader_id: str, trade_request: TradeExecuteRequest):
     """
-    Execute a trade as a leader. This will push the order to the queue for followers.
+    Execute a trade as a leader. This will push the order to the queue for followers
+    and return 202 Accepted; the background worker executes it for followers.
     
     Args:
         leader_id: ID of the leader trader
@@ -119,10 +259,10 @@ async def execute_leader_trade(leader_id: str, trade_request: TradeExecuteReques
     Returns:
         Created order information
     """
+    # order_type is already validated by the request model
+    order_type = _ORDER_MAP[trade_request.order_type]
+    
     try:
-        # Validate order type
-        order_type = OrderType.BUY if trade_request.order_type.upper() == "BUY" else OrderType.SELL
-        
         order = copy_service.execute_leader_trade(
             leader_id=leader_id,
             order_type=order_type,
@@ -131,41 +271,38 @@ async def execute_leader_trade(leader_id: str, trade_request: TradeExecuteReques
             price=trade_request.price
         )
         
-        return {
-            "message": "Trade order queued successfully",
-            "order": order.to_dict()
-        }
+        # Splice the order's cached JSON into a constant envelope
+        return Response(
+            content=_TRADE_QUEUED_PREFIX + order.to_json_bytes() + b'}',
+            media_type="application/json",
+            status_code=202
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFullError as e:
+        # Backpressure: ask the client to retry once the queue drains
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
 @app.get("/api/leaderboard")
-async def get_leaderboard():
+async def get_leaderboard(request: Request):
     """
     Get the top 5 traders from the leaderboard.
+    Responds 304 Not Modified when If-None-Match carries the current ETag.
     
     Returns:
         List of top 5 traders sorted by ROI
     """
-    try:
-        top_traders = copy_service.get_top_traders(limit=5)
-        
-        return {
-            "top_traders": [
-                {
-                    "trader_id": trader.trader_id,
-                    "name": trader.name,
-                    "roi": trader.roi,
-                    "portfolio_value": trader.portfolio_value
-                }
-                for trader in top_traders
-            ],
-            "count": len(top_traders)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    etag = f'W/"{_ETAG_BOOT_ID}-{copy_service.leaderboard_version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # Serve the cached JSON bytes directly, skipping response encoding
+    return Response(
+        content=copy_service.get_leaderboard_json(limit=5),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @app.post("/api/follow")
@@ -179,23 +316,33 @@ async def follow_leader(follow_request: FollowRequest):
     Returns:
         Success message
     """
-    try:
-        success = copy_service.add_follower(
-            leader_id=follow_request.leader_id,
-            follower_id=follow_request.follower_id
+    success = copy_service.add_follower(
+        leader_id=follow_request.leader_id,
+        follower_id=follow_request.follower_id
+    )
+    
+    if not success:
+        raise HTTPException(
+            status_code=400,
+            detail="Leader or follower not found"
         )
-        
-        if success:
-            return {
-                "message": f"Follower {follow_request.follower_id} is now following leader {follow_request.leader_id}",
-                "leader_id": follow_request.leader_id,
-                "follower_id": follow_request.follower_id
-            }
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Leader or follower not found"
-            )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "message": f"Follower {follow_request.follower_id} is now following leader {follow_request.leader_id}",
+        "leader_id": follow_request.leader_id,
+        "follower_id": follow_request.follower_id
+    }
+
 
+if __name__ == "__main__":
+    import uvicorn
+    
+    # uvloop and httptools replace the pure-Python event loop and HTTP parser;
+    # loop="auto" falls back to asyncio where uvloop is unavailable (Windows)
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="auto",
+        http="httptools",
+    )
@@ -0,0 +1,55 @@
+import unittest
+
+from app.dsa.order_queue import BUY, SELL
+from app.models.trader import TraderCreate
+from app.services.copy_service import CopyService
+
+
+class CopyServiceTest(unittest.TestCase):
+    """Fan-out of leader orders to followers."""
+
+    def setUp(self):
+        self.service = CopyService()
+        self.leader = self._register("Leader", roi=2.0)
+
+    def _register(self, name: str, roi: float = 0.0):
+        return self.service.register_trader(
+            TraderCreate(name=name, roi=roi, portfolio_value=1000.0)
+        )
+
+    def test_order_is_copied_to_each_follower_once(self):
+        followers = [self._register(f"Follower {n}") for n in range(3)]
+        for follower in followers:
+            self.assertTrue(self.service.add_follower(self.leader.trader_id, follower.trader_id))
+        # Following twice does not duplicate the fan-out
+        self.service.add_follower(self.leader.trader_id, followers[0].trader_id)
+
+        self.service.execute_leader_trade(self.leader.trader_id, BUY, "BTC/USDT", 2.0, 50.0)
+        results = self.service.process_orders_for_followers()
+
+        self.assertEqual(results[-1]["followers_count"], 3)
+        for follower in followers:
+            self.assertAlmostEqual(follower.portfolio_value, 1000.0 - 0.1)
+        self.assertAlmostEqual(self.leader.portfolio_value, 1000.0)
+
+    def test_follow_between_orders_applies_to_later_orders(self):
+        first = self._register("First")
+        self.service.add_follower(self.leader.trader_id, first.trader_id)
+        self.service.execute_leader_trade(self.leader.trader_id, SELL, "ETH/USDT", 1.0, 100.0)
+        self.service.process_orders_for_followers()
+
+        second = self._register("Second")
+        self.service.add_follower(self.leader.trader_id, second.trader_id)
+        self.service.execute_leader_trade(self.leader.trader_id, SELL, "ETH/USDT", 1.0, 100.0)
+        self.service.process_orders_for_followers()
+
+        self.assertAlmostEqual(first.portfolio_value, 1000.0 + 2 * 99.9)
+        self.assertAlmostEqual(second.portfolio_value, 1000.0 + 99.9)
+
+    def test_unknown_leader_or_follower_is_rejected(self):
+        self.assertFalse(self.service.add_follower("missing", self.leader.trader_id))
+        self.assertFalse(self.service.add_follower(self.leader.trader_id, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import gc
+import logging
+import threading
+import time
+import unittest
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Poll until predicate() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class LifespanTest(unittest.TestCase):
+    """Start and stop the app repeatedly in one process."""
+
+    def _copy_one_trade(self, client: TestClient) -> None:
+        leader_id = client.post(
+            "/api/traders", json={"name": "Leader", "roi": 1.0, "portfolio_value": 100.0}
+        ).json()["trader_id"]
+        follower_id = client.post(
+            "/api/traders", json={"name": "Follower", "roi": 0.5, "portfolio_value": 100.0}
+        ).json()["trader_id"]
+        response = client.post(
+            "/api/follow", json={"leader_id": leader_id, "follower_id": follower_id}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post(
+            f"/api/leaders/{leader_id}/trade",
+            json={"leader_id": leader_id, "order_type": "BUY",
+                  "symbol": "BTC/USDT", "quantity": 1, "price": 10},
+        )
+        self.assertEqual(response.status_code, 202)
+
+        follower = main.copy_service.get_trader(follower_id)
+        self.assertTrue(_wait_for(lambda: follower.portfolio_value != 100.0))
+        self.assertAlmostEqual(follower.portfolio_value, 99.99)
+        self.assertTrue(main.copy_service.order_queue.is_empty())
+
+    def test_restart_processes_orders_and_shuts_down_cleanly(self):
+        with self.assertNoLogs("asyncio", level="ERROR"):
+            for _ in range(2):
+                with TestClient(main.app) as client:
+                    self._copy_one_trade(client)
+                    worker_loop = main.app.state.worker_loop
+
+                self.assertTrue(worker_loop.is_closed())
+                self.assertTrue(main.app.state.order_worker.done())
+                self.assertNotIn(
+                    "order-worker", [thread.name for thread in threading.enumerate()]
+                )
+                # Pending tasks destroyed with their loop are reported on collection
+                gc.collect()
+
+    def test_queue_logging_is_attached_only_during_lifespan(self):
+        root = logging.getLogger()
+        self.assertNotIn(main._log_queue_handler, root.handlers)
+        with TestClient(main.app):
+            self.assertIn(main._log_queue_handler, root.handlers)
+        self.assertNotIn(main._log_queue_handler, root.handlers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+from app.services.market_data import MarketDataService
+
+
+def _ticker(symbol: str, last: float, timestamp: int) -> dict:
+    return {
+        'symbol': symbol, 'last': last, 'bid': last, 'ask': last, 'high': last,
+        'low': last, 'baseVolume': 1.0, 'timestamp': timestamp,
+    }
+
+
+class FakeExchange:
+    """Stands in for the ccxt client; serves whatever tickers the test sets."""
+
+    def __init__(self):
+        self.tickers = {}
+        self.batches = []
+
+    async def fetch_ticker(self, symbol):
+        return self.tickers[symbol]
+
+    async def fetch_tickers(self, symbols):
+        self.batches.append(sorted(symbols))
+        return {symbol: self.tickers[symbol] for symbol in symbols}
+
+    async def close(self):
+        pass
+
+
+class MarketDataServiceTest(unittest.TestCase):
+    """Price cache, history sampling and refresh subscriptions."""
+
+    def setUp(self):
+        self.service = MarketDataService()
+        self.exchange = FakeExchange()
+        self.service.exchange = self.exchange
+
+    def test_unchanged_ticker_is_sampled_once(self):
+        self.exchange.tickers['BTC/USDT'] = _ticker('BTC/USDT', 100.0, 1)
+        asyncio.run(self.service.get_live_price('BTC/USDT'))
+        asyncio.run(self.service.refresh_tickers())
+        asyncio.run(self.service.refresh_tickers())
+        self.assertEqual(self.service.get_historical_prices('BTC/USDT'), [100.0])
+
+        self.exchange.tickers['BTC/USDT'] = _ticker('BTC/USDT', 101.0, 2)
+        asyncio.run(self.service.refresh_tickers())
+        self.assertEqual(self.service.get_historical_prices('BTC/USDT'), [100.0, 101.0])
+
+    def test_only_recently_requested_symbols_are_refreshed(self):
+        for symbol in ('BTC/USDT', 'ETH/USDT'):
+            self.exchange.tickers[symbol] = _ticker(symbol, 1.0, 1)
+            asyncio.run(self.service.get_live_price(symbol))
+
+        # ETH/USDT has not been requested within the subscription TTL
+        self.service._last_requested['ETH/USDT'] -= self.service.SUBSCRIPTION_TTL + 1
+        asyncio.run(self.service.refresh_tickers())
+        self.assertEqual(self.exchange.batches, [['BTC/USDT']])
+
+    def test_no_refresh_without_subscriptions(self):
+        asyncio.run(self.service.refresh_tickers())
+        self.assertEqual(self.exchange.batches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+
+from app.dsa.order_queue import BUY, Order, OrderQueue, QueueFullError
+
+
+def _order(n: int) -> Order:
+    return Order(order_id=str(n), order_type=BUY, symbol="BTC/USDT", quantity=1.0, price=1.0)
+
+
+def _ids(orders) -> list:
+    return [order.order_id for order in orders]
+
+
+class OrderQueueTest(unittest.TestCase):
+    """FIFO behaviour of the ring-buffer OrderQueue."""
+
+    def test_fifo_across_wraparound(self):
+        queue = OrderQueue(maxsize=4)
+        for n in range(3):
+            queue.enqueue(_order(n))
+        self.assertEqual(queue.dequeue().order_id, "0")
+        self.assertEqual(queue.dequeue().order_id, "1")
+        # Tail wraps past the end of the buffer
+        for n in range(3, 6):
+            queue.enqueue(_order(n))
+        self.assertEqual(_ids(queue.get_all()), ["2", "3", "4", "5"])
+        self.assertEqual(_ids(queue.drain(3)), ["2", "3", "4"])
+        self.assertEqual(_ids(queue.drain()), ["5"])
+        self.assertTrue(queue.is_empty())
+        self.assertIsNone(queue.dequeue())
+
+    def test_bounded_queue_rejects_when_full(self):
+        queue = OrderQueue(maxsize=2)
+        queue.enqueue(_order(0))
+        queue.enqueue(_order(1))
+        with self.assertRaises(QueueFullError):
+            queue.enqueue(_order(2))
+        self.assertEqual(queue.size(), 2)
+
+    def test_unbounded_queue_grows_in_order(self):
+        queue = OrderQueue()
+        count = OrderQueue.INITIAL_CAPACITY * 2 + 1
+        queue.enqueue(_order(-1))
+        queue.dequeue()  # Start from a non-zero head so growth must unwrap
+        for n in range(count):
+            queue.enqueue(_order(n))
+        self.assertEqual(_ids(queue.drain()), [str(n) for n in range(count)])
+
+    def test_drain_bounds(self):
+        queue = OrderQueue(maxsize=4)
+        for n in range(3):
+            queue.enqueue(_order(n))
+        self.assertEqual(queue.drain(0), [])
+        with self.assertRaises(ValueError):
+            queue.drain(-1)
+        self.assertEqual(queue.size(), 3)
+        self.assertEqual(_ids(queue.drain(10)), ["0", "1", "2"])
+
+    def test_concurrent_producers(self):
+        queue = OrderQueue()
+        per_thread = 1000
+
+        def produce(offset: int) -> None:
+            for n in range(per_thread):
+                queue.enqueue(_order(offset + n))
+
+        threads = [threading.Thread(target=produce, args=(i * per_thread,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        drained = _ids(queue.drain())
+        self.assertEqual(sorted(drained, key=int), [str(n) for n in range(4 * per_thread)])
+        self.assertTrue(queue.is_empty())
+
+
+if __name__ == "__main__":
+    unittest.main()